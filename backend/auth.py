@@ -1,44 +1,62 @@
+import asyncio
+import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
-from jose import JWTError, jwt
+import jwt
+from jwt.exceptions import PyJWTError as JWTError
+from argon2 import PasswordHasher
+from argon2.exceptions import VerifyMismatchError
 import bcrypt
-import os
-from dotenv import load_dotenv
+from config import settings
 
-load_dotenv() 
-
-SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
+SECRET_KEY = settings.secret_key
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 480  # 8 hours
- 
+
+# argon2id hasher for new passwords - tuned for ~50ms verification while
+# actually using memory-hardness and parallelism, unlike bcrypt's fixed cost
+_ph = PasswordHasher(time_cost=2, memory_cost=64 * 1024, parallelism=2)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a hash"""
+    """Verify a password against a hash (argon2id, or bcrypt for legacy hashes)"""
     try:
-        # Handle both string and bytes
-        if isinstance(hashed_password, str):
-            hashed_password = hashed_password.encode('utf-8')
-        if isinstance(plain_password, str):
-            plain_password = plain_password.encode('utf-8')
-        return bcrypt.checkpw(plain_password, hashed_password)
+        if isinstance(hashed_password, bytes):
+            hashed_password = hashed_password.decode('utf-8')
+        # Legacy bcrypt hashes start with the $2 modular-crypt prefix
+        if hashed_password.startswith("$2"):
+            if isinstance(plain_password, str):
+                plain_password = plain_password.encode('utf-8')
+            return bcrypt.checkpw(plain_password, hashed_password.encode('utf-8'))
+        try:
+            _ph.verify(hashed_password, plain_password)
+            return True
+        except VerifyMismatchError:
+            return False
     except Exception as e:
         print(f"Password verification error: {str(e)}")
         return False
 
 def get_password_hash(password: str) -> str:
-    """Hash a password"""
+    """Hash a password with argon2id"""
     try:
-        # Convert to bytes if string
-        if isinstance(password, str):
-            password = password.encode('utf-8')
-        # Generate salt and hash
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password, salt)
-        # Return as string
-        return hashed.decode('utf-8')
+        return _ph.hash(password)
     except Exception as e:
         print(f"Password hashing error: {str(e)}")
         raise
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the threadpool so bcrypt doesn't block the event loop"""
+    return await asyncio.get_running_loop().run_in_executor(
+        None, verify_password, plain_password, hashed_password
+    )
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the threadpool so bcrypt doesn't block the event loop"""
+    return await asyncio.get_running_loop().run_in_executor(
+        None, get_password_hash, password
+    )
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -49,9 +67,28 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+# Tokens revoked before expiry (e.g. logout) - checked before the decode cache
+_revoked_tokens = set()
+
+@lru_cache(maxsize=10000)
+def _decode_cached(token: str):
+    """Decode and verify a JWT once; tokens are immutable so the result is
+    safe to memoize for the token's lifetime (expiry is re-checked on hit)"""
+    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+def revoke_token(token: str):
+    """Invalidate a token before its natural expiry"""
+    _revoked_tokens.add(token)
+
 def verify_token(token: str):
+    if token in _revoked_tokens:
+        return None
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _decode_cached(token)
+        # PyJWT checks exp on first decode; re-check cheaply on cache hits
+        exp = payload.get("exp")
+        if exp is not None and exp < time.time():
+            return None
         return payload
     except JWTError:
         return None
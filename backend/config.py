@@ -0,0 +1,29 @@
+import os
+from dataclasses import dataclass
+from dotenv import load_dotenv
+
+# Parse .env exactly once at import; every service previously re-ran
+# load_dotenv() and scattered os.getenv reads across its own module
+load_dotenv()
+
+@dataclass(frozen=True)
+class Settings:
+    # Azure Speech Services
+    azure_speech_key: str = os.getenv("AZURE_SPEECH_KEY", "")
+    azure_speech_region: str = os.getenv("AZURE_SPEECH_REGION", "eastus")
+
+    # Azure Face API
+    azure_face_endpoint: str = os.getenv("AZURE_FACE_ENDPOINT", "")
+    azure_face_key: str = os.getenv("AZURE_FACE_KEY", "")
+
+    # LLM services
+    openrouter_api_key: str = os.getenv("OPENROUTER_API_KEY", "")
+    openrouter_model: str = os.getenv("OPENROUTER_MODEL", "openai/gpt-4o-mini")
+
+    # Auth
+    secret_key: str = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
+
+    # Database
+    database_url: str = os.getenv("DATABASE_URL", "sqlite:///./interview.db")
+
+settings = Settings()
@@ -1,16 +1,37 @@
 import httpx
-import os
+import orjson
+import re
 from typing import Dict, List
-from dotenv import load_dotenv
+from config import settings
 from models import Interview, Answer
 
-load_dotenv()
+# Extracts the payload of a ```json fenced block (or any fenced block)
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.S)
+# Opening fence marker alone - the streaming cutoff in evaluate_answer can
+# stop before the closing fence arrives
+_FENCE_OPEN = re.compile(r"^```(?:json)?\s*")
 
 class EvaluationService:
     def __init__(self):
-        self.openrouter_api_key = os.getenv("OPENROUTER_API_KEY")
+        self.openrouter_api_key = settings.openrouter_api_key
         self.openrouter_url = "https://openrouter.ai/api/v1/chat/completions"
-    
+        self.model = settings.openrouter_model
+        # One shared client so the connection pool amortizes TCP+TLS handshakes
+        # across all evaluations instead of paying them per call
+        self._client = httpx.AsyncClient(
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=20),
+            headers={
+                "Authorization": f"Bearer {self.openrouter_api_key}",
+                "Content-Type": "application/json"
+            }
+        )
+
+    async def aclose(self):
+        """Close the shared HTTP client (called on app shutdown)"""
+        await self._client.aclose()
+
     async def evaluate_answer(self, question: str, answer: str, interview_type: str) -> Dict:
         """Evaluate an answer and provide score and feedback"""
         try:
@@ -30,58 +51,71 @@ Return your response in JSON format:
     "feedback": "<detailed feedback>"
 }}"""
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.openrouter_url,
-                    headers={
-                        "Authorization": f"Bearer {self.openrouter_api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": "openai/gpt-4",
-                        "messages": [
-                            {"role": "system", "content": "You are an expert interview evaluator. Always respond with valid JSON."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        "temperature": 0.3,
-                        "max_tokens": 500
-                    },
-                    timeout=30.0
-                )
-                
+            # Stream the completion and stop as soon as the JSON object closes;
+            # for short structured answers this skips a good chunk of the
+            # trailing tokens
+            buf = ""
+            async with self._client.stream(
+                "POST",
+                self.openrouter_url,
+                json={
+                    "model": self.model,
+                    "messages": [
+                        {"role": "system", "content": "You are an expert interview evaluator. Always respond with valid JSON."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    "temperature": 0.3,
+                    "max_tokens": 500,
+                    "stream": True
+                }
+            ) as response:
                 if response.status_code == 200:
-                    data = response.json()
-                    content = data["choices"][0]["message"]["content"].strip()
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data: "):
+                            continue
+                        data = line[6:]
+                        if data == "[DONE]":
+                            break
+                        try:
+                            delta = orjson.loads(data)["choices"][0]["delta"].get("content") or ""
+                        except (orjson.JSONDecodeError, LookupError):
+                            continue
+                        buf += delta
+                        stripped = buf.strip()
+                        if stripped.endswith("}") and stripped.count("{") == stripped.count("}"):
+                            break
+
+            if buf:
+                content = buf.strip()
+
+                # Try to parse JSON from response
+                try:
+                    # Extract JSON from markdown code blocks if present; the
+                    # early break above can cut the stream before the closing
+                    # fence, so fall back to stripping just the opening marker
+                    m = _FENCE.search(content)
+                    payload = m.group(1) if m else _FENCE_OPEN.sub("", content)
+
+                    evaluation = orjson.loads(payload)
+                    return {
+                        "score": float(evaluation.get("score", 50)),
+                        "feedback": evaluation.get("feedback", "No feedback provided")
+                    }
+                except orjson.JSONDecodeError:
+                    # Fallback parsing
+                    score = 50
+                    feedback = content
+                    if "score" in content.lower():
+                        try:
+                            score_str = content.split("score")[1].split()[0].replace(":", "").replace(",", "")
+                            score = float(score_str)
+                        except:
+                            pass
                     
-                    # Try to parse JSON from response
-                    import json
-                    try:
-                        # Extract JSON from markdown code blocks if present
-                        if "```json" in content:
-                            content = content.split("```json")[1].split("```")[0].strip()
-                        elif "```" in content:
-                            content = content.split("```")[1].split("```")[0].strip()
-                        
-                        evaluation = json.loads(content)
-                        return {
-                            "score": float(evaluation.get("score", 50)),
-                            "feedback": evaluation.get("feedback", "No feedback provided")
-                        }
-                    except json.JSONDecodeError:
-                        # Fallback parsing
-                        score = 50
-                        feedback = content
-                        if "score" in content.lower():
-                            try:
-                                score_str = content.split("score")[1].split()[0].replace(":", "").replace(",", "")
-                                score = float(score_str)
-                            except:
-                                pass
-                        
-                        return {
-                            "score": score,
-                            "feedback": feedback
-                        }
+                    return {
+                        "score": score,
+                        "feedback": feedback
+                    }
         except Exception as e:
             print(f"Error evaluating answer: {str(e)}")
         
@@ -91,19 +125,96 @@ Return your response in JSON format:
             "feedback": "Answer received. Evaluation pending."
         }
     
+    async def evaluate_answers_batch(self, items: List[tuple]) -> List[Dict]:
+        """Evaluate several (question, answer, interview_type) tuples in one LLM call
+
+        Coalescing all pairs into a single prompt saves one network round trip
+        and one prompt preamble per answer compared to calling evaluate_answer
+        in a loop.
+        """
+        if not items:
+            return []
+        try:
+            pairs_text = "\n\n".join(
+                f"Pair {i + 1} ({interview_type} interview)\nQuestion: {question}\nAnswer: {answer}"
+                for i, (question, answer, interview_type) in enumerate(items)
+            )
+
+            prompt = f"""Evaluate each of the following interview answers.
+
+{pairs_text}
+
+For every pair provide:
+1. A score from 0 to 100
+2. Detailed feedback on the answer
+
+Return your response as a JSON array with one object per pair, in order:
+[{{"score": <number>, "feedback": "<detailed feedback>"}}, ...]"""
+
+            response = await self._client.post(
+                self.openrouter_url,
+                json={
+                    "model": self.model,
+                    "messages": [
+                        {"role": "system", "content": "You are an expert interview evaluator. Always respond with valid JSON."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    "temperature": 0.3,
+                    "max_tokens": 500 * len(items)
+                }
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                content = data["choices"][0]["message"]["content"].strip()
+
+                try:
+                    # Extract JSON from markdown code blocks if present
+                    m = _FENCE.search(content)
+                    payload = m.group(1) if m else content
+
+                    evaluations = orjson.loads(payload)
+                    if isinstance(evaluations, list) and len(evaluations) == len(items):
+                        return [
+                            {
+                                "score": float(e.get("score", 50)),
+                                "feedback": e.get("feedback", "No feedback provided")
+                            }
+                            for e in evaluations
+                        ]
+                except orjson.JSONDecodeError:
+                    pass
+        except Exception as e:
+            print(f"Error evaluating answers batch: {str(e)}")
+
+        # Fallback: evaluate individually but concurrently
+        import asyncio
+        return await asyncio.gather(
+            *[self.evaluate_answer(question, answer, interview_type)
+              for question, answer, interview_type in items]
+        )
+
     async def generate_summary(self, interview: Interview, answers: List[Answer], db=None) -> str:
         """Generate final interview summary"""
         try:
+            # Fetch all question texts in one IN query instead of one query per answer
+            qmap = {}
+            if db:
+                from sqlalchemy import select
+                from models import Question
+                question_ids = [answer.question_id for answer in answers]
+                qmap = {
+                    qid: text
+                    for qid, text in await db.execute(
+                        select(Question.id, Question.question_text)
+                        .where(Question.id.in_(question_ids))
+                    )
+                }
+
             # Build answers text
             answers_text_parts = []
             for i, answer in enumerate(answers):
-                # Get question text from database if available
-                if db:
-                    from models import Question
-                    question = db.query(Question).filter(Question.id == answer.question_id).first()
-                    question_text = question.question_text if question else "Question not found"
-                else:
-                    question_text = "Question"
+                question_text = qmap.get(answer.question_id, "Question not found") if db else "Question"
                 answers_text_parts.append(f"Q{i+1}: {question_text}\nA{i+1}: {answer.answer_text}\nScore: {answer.score}\n")
             answers_text = "\n".join(answers_text_parts)
             
@@ -127,28 +238,22 @@ Provide a detailed summary including:
 
 Be professional and constructive."""
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.openrouter_url,
-                    headers={
-                        "Authorization": f"Bearer {self.openrouter_api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": "openai/gpt-4",
-                        "messages": [
-                            {"role": "system", "content": "You are an expert interview evaluator providing comprehensive feedback."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        "temperature": 0.5,
-                        "max_tokens": 1000
-                    },
-                    timeout=30.0
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    return data["choices"][0]["message"]["content"].strip()
+            response = await self._client.post(
+                self.openrouter_url,
+                json={
+                    "model": self.model,
+                    "messages": [
+                        {"role": "system", "content": "You are an expert interview evaluator providing comprehensive feedback."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    "temperature": 0.5,
+                    "max_tokens": 1000
+                }
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                return data["choices"][0]["message"]["content"].strip()
         except Exception as e:
             print(f"Error generating summary: {str(e)}")
         
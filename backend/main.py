@@ -1,27 +1,40 @@
 from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 import os
-from dotenv import load_dotenv
+import base64
+import logging
 import json
+import orjson
 import asyncio
+import random
+import time
+import uuid
+import aiofiles
 
 from database import SessionLocal, engine, Base
 from models import User, Interview, Question, Answer, Sample
 from schemas import UserCreate, UserLogin, InterviewCreate, QuestionResponse, AnswerSubmit
-from auth import verify_token, create_access_token, get_password_hash, verify_password
+from auth import verify_token, create_access_token, get_password_hash_async, verify_password_async
 from face_recognition_service import FaceRecognitionService
 from audio_service import AudioService
 from question_service import QuestionService
 from evaluation_service import EvaluationService
 
-load_dotenv()
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("interview")
 
-Base.metadata.create_all(bind=engine)
+# Private generator so the answer-mode coin flip doesn't contend on the
+# shared module-level Twister under threaded handlers
+_rng = random.Random()
 
-app = FastAPI(title="AI Interview Automation API")
+# Every JSON response body goes through orjson instead of stdlib json
+app = FastAPI(title="AI Interview Automation API", default_response_class=ORJSONResponse)
 
 # CORS middleware
 app.add_middleware(
@@ -40,49 +53,131 @@ audio_service = AudioService()
 question_service = QuestionService()
 evaluation_service = EvaluationService()
 
+# Create working directories once at import instead of re-running makedirs
+# on every upload/verify tick
+os.makedirs("samples", exist_ok=True)
+os.makedirs("temp", exist_ok=True)
+
+@app.on_event("startup")
+async def init_db():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+@app.on_event("shutdown")
+async def shutdown_services():
+    await evaluation_service.aclose()
+    await face_service.aclose()
+    await question_service.aclose()
+
+async def _write_bytes(path: str, data: bytes):
+    async with aiofiles.open(path, "wb") as f:
+        await f.write(data)
+
+async def _stream_to_disk(upload: UploadFile, path: str, first_chunk: bytes = b"") -> int:
+    """Copy an UploadFile to disk in 64KB chunks; returns bytes written
+
+    Keeps peak memory per upload at one chunk instead of the whole payload.
+    """
+    size = len(first_chunk)
+    async with aiofiles.open(path, "wb") as out:
+        if first_chunk:
+            await out.write(first_chunk)
+        while chunk := await upload.read(1 << 16):
+            await out.write(chunk)
+            size += len(chunk)
+    return size
+
+# Latest-sample cache keyed by interview id: samples do not change during an
+# interview, so the 5-second REST verify loop can skip the indexed SELECT.
+# Populated in start_interview/verify_user, invalidated on sample upload.
+_sample_cache = {}
+_sample_cache_ttl = 1800.0
+
+# Face-id backfill coalescing: result cache plus a per-sample lock so only
+# one coroutine re-processes a given sample photo through Azure while
+# concurrent 5s verify ticks await the same result. Failed attempts are
+# cached too, so a bad photo cannot stampede the API.
+_backfill_cache = {}  # {sample_id: (face_id_or_None, ts)}
+_backfill_locks = {}
+_backfill_ttl = 3600.0
+
+async def _backfill_face_id(sample):
+    cached = _backfill_cache.get(sample.id)
+    if cached is not None and time.monotonic() - cached[1] < _backfill_ttl:
+        return cached[0]
+    lock = _backfill_locks.setdefault(sample.id, asyncio.Lock())
+    async with lock:
+        cached = _backfill_cache.get(sample.id)
+        if cached is not None and time.monotonic() - cached[1] < _backfill_ttl:
+            return cached[0]
+        face_id = await face_service.process_sample(sample.video_path)
+        _backfill_cache[sample.id] = (face_id, time.monotonic())
+        return face_id
+
+# Magic bytes for photo formats the face service accepts as-is; uploads
+# matching one of these are stored untouched instead of being decoded and
+# re-encoded through PIL
+_PHOTO_SIGS = {
+    b'\xff\xd8\xff': '.jpg',
+    b'\x89PNG\r\n\x1a\n': '.png',
+    b'GIF8': '.gif',
+    b'BM': '.bmp',
+}
+
 # Dependency
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
+# Authenticated-user cache keyed by token: {token: (user, ts)}. verify_user
+# presents the same token every 5 seconds, so a short TTL skips the per-request
+# user SELECT without outliving the token's own expiry checks.
+_user_cache = {}
+_user_cache_ttl = 60.0
+_user_cache_max = 10000
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: AsyncSession = Depends(get_db)):
     token = credentials.credentials
     payload = verify_token(token)
     if payload is None:
         raise HTTPException(status_code=401, detail="Invalid token")
-    user = db.query(User).filter(User.email == payload.get("sub")).first()
+    now = time.monotonic()
+    cached = _user_cache.get(token)
+    if cached is not None and now - cached[1] < _user_cache_ttl:
+        return cached[0]
+    user = await db.scalar(select(User).where(User.email == payload.get("sub")))
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
+    if len(_user_cache) >= _user_cache_max:
+        _user_cache.clear()
+    _user_cache[token] = (user, now)
     return user
 
 @app.post("/api/auth/register")
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
-    # Check if user exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
-    # Create user
-    hashed_password = get_password_hash(user_data.password)
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
+    # Create user; the UNIQUE index on email is the duplicate check, which
+    # avoids a pre-SELECT and the race between two concurrent registrations
+    hashed_password = await get_password_hash_async(user_data.password)
     user = User(
         email=user_data.email,
         password_hash=hashed_password,
         full_name=user_data.full_name
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Email already registered")
+    await db.refresh(user)
     
     token = create_access_token({"sub": user.email})
     return {"access_token": token, "token_type": "bearer", "user": {"id": user.id, "email": user.email, "full_name": user.full_name}}
 
 @app.post("/api/auth/login")
-async def login(user_data: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == user_data.email).first()
-    if not user or not verify_password(user_data.password, user.password_hash):
+async def login(user_data: UserLogin, db: AsyncSession = Depends(get_db)):
+    user = await db.scalar(select(User).where(User.email == user_data.email))
+    if not user or not await verify_password_async(user_data.password, user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     token = create_access_token({"sub": user.email})
@@ -93,52 +188,62 @@ async def upload_samples(
     photo: UploadFile = File(...),
     audio: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Upload photo and audio samples for user verification"""
     try:
-        # Save photo sample
-        photo_path = f"samples/{current_user.id}_photo.jpg"
-        os.makedirs("samples", exist_ok=True)
-        content = await photo.read()
-        
+        # Save photo sample; peek at the first chunk for the signature check
+        # so recognized formats stream to disk without buffering the payload
+        head = await photo.read(1 << 16)
+
         # Validate image content
-        if not content or len(content) == 0:
+        if not head:
             raise HTTPException(status_code=400, detail="Photo file is empty. Please upload a valid image.")
-        
-        # Check if it's a valid image by checking file signature
-        if not content.startswith(b'\xff\xd8\xff'):  # JPEG signature
+
+        # Dispatch on the file signature: known-good formats are written
+        # as-is with a matching extension, only unknown formats pay for a
+        # PIL decode + JPEG re-encode
+        ext = next((e for sig, e in _PHOTO_SIGS.items() if head.startswith(sig)), None)
+        photo_path = f"samples/{current_user.id}_photo{ext or '.jpg'}"
+        if ext is None:
+            # PIL needs the whole image in memory to convert it
+            content = head + await photo.read()
+            photo_size = len(content)
             # Try to convert if it's a different format
             try:
-                from PIL import Image
-                import io
-                img = Image.open(io.BytesIO(content))
-                # Convert to RGB if needed (handles RGBA, etc.)
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                # Save as JPEG
-                img.save(photo_path, 'JPEG', quality=95)
-                print(f"Converted image to JPEG format: {photo_path}")
+                def _convert():
+                    from PIL import Image
+                    import io
+                    img = Image.open(io.BytesIO(content))
+                    # Convert to RGB if needed (handles RGBA, etc.)
+                    if img.mode != 'RGB':
+                        img = img.convert('RGB')
+                    # Save as JPEG
+                    img.save(photo_path, 'JPEG', quality=95)
+                # PIL's C decode/encode would block the event loop; run it on
+                # the default executor
+                await asyncio.get_running_loop().run_in_executor(None, _convert)
+                logger.info("Converted image to JPEG format: %s", photo_path)
             except Exception as img_error:
-                print(f"Error converting image: {str(img_error)}")
+                logger.error("Error converting image: %s", img_error)
                 raise HTTPException(status_code=400, detail=f"Invalid image format. Please upload a JPEG, PNG, or other common image format. Error: {str(img_error)}")
         else:
-            # Valid JPEG, save directly
-            with open(photo_path, "wb") as f:
-                f.write(content)
-        
-        print(f"Photo saved: {photo_path}, size: {len(content)} bytes")
-        
+            # Recognized format, stream straight to disk
+            photo_size = await _stream_to_disk(photo, photo_path, head)
+
+        logger.debug("Photo saved: %s, size: %d bytes", photo_path, photo_size)
+
         # Save audio sample
         audio_path = f"samples/{current_user.id}_audio.webm"
-        with open(audio_path, "wb") as f:
-            content = await audio.read()
-            f.write(content)
+        await _stream_to_disk(audio, audio_path)
         
-        # Process samples for face and audio recognition
-        print(f"Processing face sample for user {current_user.id}...")
-        face_id = await face_service.process_sample(photo_path)
-        audio_reference = await audio_service.process_sample(audio_path)  # Store audio path for verification
+        # Process samples for face and audio recognition; the two services are
+        # independent (Azure vs local audio) so run them concurrently
+        logger.debug("Processing face sample for user %s...", current_user.id)
+        face_id, audio_reference = await asyncio.gather(
+            face_service.process_sample(photo_path),
+            audio_service.process_sample(audio_path)  # Store audio path for verification
+        )
         
         if not face_id:
             # Check if Azure Face API is available
@@ -171,10 +276,14 @@ async def upload_samples(
             audio_features=audio_reference if audio_reference else None  # Store audio path for verification
         )
         db.add(sample)
-        db.commit()
-        db.refresh(sample)
+        await db.commit()
+        await db.refresh(sample)
+
+        # New samples supersede any cached sample rows for this user
+        for key in [k for k, v in _sample_cache.items() if v[0].user_id == current_user.id]:
+            del _sample_cache[key]
         
-        print(f"Sample stored successfully. Face ID: {face_id}, Sample ID: {sample.id}")
+        logger.info("Sample stored successfully. Face ID: %s, Sample ID: %s", face_id, sample.id)
         
         return {"message": "Samples uploaded successfully", "sample_id": sample.id, "face_id": face_id}
     except Exception as e:
@@ -184,14 +293,17 @@ async def upload_samples(
 async def start_interview(
     interview_data: InterviewCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Start a new interview"""
     # Check if user has samples
-    sample = db.query(Sample).filter(Sample.user_id == current_user.id).order_by(Sample.created_at.desc()).first()
+    sample = await db.scalar(
+        select(Sample).where(Sample.user_id == current_user.id)
+        .order_by(Sample.created_at.desc()).limit(1)
+    )
     if not sample:
         raise HTTPException(status_code=400, detail="Please upload video and audio samples first")
-    
+
     # Create interview
     interview = Interview(
         user_id=current_user.id,
@@ -199,36 +311,42 @@ async def start_interview(
         status="in_progress"
     )
     db.add(interview)
-    db.commit()
-    db.refresh(interview)
-    
+    await db.commit()
+    await db.refresh(interview)
+
+    # The sample was just fetched; prime the verify loop's cache with it
+    _sample_cache[interview.id] = (sample, time.monotonic())
+
     return {"interview_id": interview.id, "message": "Interview started"}
 
 @app.get("/api/interviews/{interview_id}/question")
 async def get_question(
     interview_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get next question for the interview"""
-    interview = db.query(Interview).filter(Interview.id == interview_id, Interview.user_id == current_user.id).first()
+    interview = await db.scalar(
+        select(Interview).where(Interview.id == interview_id, Interview.user_id == current_user.id)
+    )
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
-    
+
     # Check interview status first
     if interview.status == "completed":
         return {"completed": True, "message": "Interview already completed"}
-    
+
     if interview.status == "terminated":
         return {"completed": True, "terminated": True, "message": "Interview was terminated"}
-    
-    # Get answered questions count
-    answered_count = db.query(Answer).filter(Answer.interview_id == interview_id).count()
-    
+
+    # Get answered questions count from the denormalized counter maintained
+    # by submit_answer - no COUNT(*) round trip
+    answered_count = interview.answered_count or 0
+
     if answered_count >= 10:
         # Interview complete
         interview.status = "completed"
-        db.commit()
+        await db.commit()
         return {"completed": True, "message": "Interview completed"}
     
     # Generate or get question
@@ -243,12 +361,11 @@ async def get_question(
         difficulty=question.get("difficulty", "medium")
     )
     db.add(db_question)
-    db.commit()
-    db.refresh(db_question)
+    await db.commit()
+    await db.refresh(db_question)
     
     # Randomly assign answer mode (speaking or writing)
-    import random
-    answer_mode = random.choice(["speaking", "writing"])
+    answer_mode = "speaking" if _rng.getrandbits(1) else "writing"
     
     # Generate TTS audio for the question if answer mode is speaking
     question_audio_url = None
@@ -257,10 +374,8 @@ async def get_question(
         audio_data = await audio_service.text_to_speech(db_question.question_text)
         if audio_data:
             # Save audio to a temporary file
-            import uuid
             audio_filename = f"question_audio_{db_question.id}_{uuid.uuid4().hex[:8]}.wav"
             audio_path = f"temp/{audio_filename}"
-            os.makedirs("temp", exist_ok=True)
             with open(audio_path, "wb") as f:
                 f.write(audio_data)
             # Return URL path for the audio
@@ -282,20 +397,24 @@ async def submit_answer(
     interview_id: int,
     answer_data: AnswerSubmit,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Submit answer for a question"""
-    interview = db.query(Interview).filter(Interview.id == interview_id, Interview.user_id == current_user.id).first()
+    interview = await db.scalar(
+        select(Interview).where(Interview.id == interview_id, Interview.user_id == current_user.id)
+    )
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
-    
+
     if interview.status == "terminated":
         raise HTTPException(status_code=400, detail="Interview has been terminated")
-    
+
     if interview.status == "completed":
         raise HTTPException(status_code=400, detail="Interview already completed")
-    
-    question = db.query(Question).filter(Question.id == answer_data.question_id, Question.interview_id == interview_id).first()
+
+    question = await db.scalar(
+        select(Question).where(Question.id == answer_data.question_id, Question.interview_id == interview_id)
+    )
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
     
@@ -314,16 +433,14 @@ async def submit_answer(
         score=evaluation["score"],
         feedback=evaluation["feedback"]
     )
+    # Bump the denormalized counter in the same transaction as the insert;
+    # no COUNT(*) needed to know whether this was the last question
     db.add(answer)
-    db.commit()
-    
-    # Check if this was the last question (10 questions total)
-    answered_count = db.query(Answer).filter(Answer.interview_id == interview_id).count()
-    is_completed = answered_count >= 10
-    
+    interview.answered_count = (interview.answered_count or 0) + 1
+    is_completed = interview.answered_count >= 10
     if is_completed:
         interview.status = "completed"
-        db.commit()
+    await db.commit()
     
     return {
         "answer_id": answer.id,
@@ -337,10 +454,12 @@ async def submit_answer(
 async def terminate_interview(
     interview_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Terminate interview (e.g., due to tab switch)"""
-    interview = db.query(Interview).filter(Interview.id == interview_id, Interview.user_id == current_user.id).first()
+    interview = await db.scalar(
+        select(Interview).where(Interview.id == interview_id, Interview.user_id == current_user.id)
+    )
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
     
@@ -352,8 +471,8 @@ async def terminate_interview(
     elif interview.status == "terminated" and interview.termination_reason:
         # Already terminated with a specific reason, don't change it
         pass
-    
-    db.commit()
+
+    await db.commit()
     
     return {"message": "Interview terminated", "interview_id": interview_id}
 
@@ -363,73 +482,122 @@ async def verify_user(
     snapshot: UploadFile = File(...),
     audio_clip: Optional[UploadFile] = File(None),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Verify user identity during interview (called every 5 seconds)"""
-    interview = db.query(Interview).filter(Interview.id == interview_id, Interview.user_id == current_user.id).first()
+    # The sample is cached per interview for the 5s polling loop; on a warm
+    # tick only the interview row is fetched. A cold tick pulls interview and
+    # latest sample in one joined query instead of two sequential round trips
+    cached = _sample_cache.get(interview_id)
+    if cached is not None and time.monotonic() - cached[1] < _sample_cache_ttl:
+        sample = cached[0]
+        interview = await db.scalar(
+            select(Interview).where(Interview.id == interview_id, Interview.user_id == current_user.id)
+        )
+    else:
+        row = (await db.execute(
+            select(Interview, Sample)
+            .join(Sample, Sample.user_id == Interview.user_id)
+            .where(Interview.id == interview_id, Interview.user_id == current_user.id)
+            .order_by(Sample.created_at.desc())
+            .limit(1)
+        )).first()
+        if row is not None:
+            interview, sample = row
+            _sample_cache[interview_id] = (sample, time.monotonic())
+        else:
+            # Empty join can mean missing interview or missing sample -
+            # look up the interview alone so the error code is right
+            interview = await db.scalar(
+                select(Interview).where(Interview.id == interview_id, Interview.user_id == current_user.id)
+            )
+            sample = None
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
-    
-    # Get user's sample
-    sample = db.query(Sample).filter(Sample.user_id == current_user.id).order_by(Sample.created_at.desc()).first()
     if not sample:
         raise HTTPException(status_code=400, detail="No samples found")
-    
-    # Save snapshot temporarily
-    snapshot_path = f"temp/{interview_id}_snapshot.jpg"
-    os.makedirs("temp", exist_ok=True)
-    with open(snapshot_path, "wb") as f:
-        content = await snapshot.read()
-        f.write(content)
-    
+
+    # The snapshot stays in memory - the face service accepts raw bytes, so
+    # there is no temp-file write/read/remove cycle for it. Only the audio
+    # clip touches disk (its decoder needs a real file), under a unique name
+    # so concurrent ticks for the same interview cannot collide. The two
+    # uploads are independent streams, so they are drained concurrently.
+    audio_path = None
+    if audio_clip:
+        audio_path = f"temp/{interview_id}_{uuid.uuid4().hex[:8]}_audio.webm"
+        snap_bytes, _ = await asyncio.gather(
+            snapshot.read(),
+            _stream_to_disk(audio_clip, audio_path)
+        )
+    else:
+        snap_bytes = await snapshot.read()
+
+    return await _run_verification(db, interview, sample, snap_bytes, audio_path)
+
+async def _run_verification(db, interview, sample, snapshot_bytes, audio_path):
+    """Shared verification core for the REST endpoint and the WebSocket
+
+    Runs face (and optionally audio) verification against the stored sample,
+    updates alert/termination state with a single commit, and removes the
+    audio temp file. Returns the response dict.
+    """
     # Verify face - returns (is_match, reason)
     # Get stored face ID - try to get it from sample, or re-process the stored photo if needed
     stored_face_id = sample.face_encoding
     
-    # If no face ID stored, try to extract it from the stored photo
+    # If no face ID stored, try to extract it from the stored photo.
+    # The backfill is only staged here; it rides along with the single
+    # commit at the end of the request
+    pending_writes = False
     if not stored_face_id and sample.video_path and os.path.exists(sample.video_path):
-        print("No face ID in database, attempting to extract from stored photo...")
-        stored_face_id = await face_service.process_sample(sample.video_path)
-        if stored_face_id:
-            # Update the sample with the extracted face ID
+        logger.info("No face ID in database, attempting to extract from stored photo...")
+        stored_face_id = await _backfill_face_id(sample)
+        if stored_face_id and sample.face_encoding != stored_face_id:
+            # Update the sample with the extracted face ID; merge in case the
+            # row came from the per-interview cache and is detached
+            sample = await db.merge(sample)
             sample.face_encoding = stored_face_id
-            db.commit()
-            print(f"Extracted and stored face ID: {stored_face_id}")
-    
-    face_match, face_reason = await face_service.verify_face(snapshot_path, stored_face_id)
+            pending_writes = True
+            logger.info("Extracted and stored face ID: %s", stored_face_id)
     
-    # Check for face violations - send alert immediately on first failure
-    is_face_violation = face_reason in ["no_face", "different_face"]
-    
-    if is_face_violation:
-        print(f"Face violation detected: {face_reason}")
-    else:
-        print(f"Face verification passed: {face_reason}")
-    
-    # Verify audio - compare with stored audio sample (captured before interview)
-    audio_match = True
-    audio_path = None
-    if audio_clip:
-        audio_path = f"temp/{interview_id}_audio.webm"
-        with open(audio_path, "wb") as f:
-            content = await audio_clip.read()
-            f.write(content)
+    # Build the audio verification task (clip already on disk)
+    audio_task = None
+    if audio_path:
         # Verify against stored audio sample path (photo and audio captured before interview start)
         stored_audio_path = sample.audio_path  # Path to original audio sample captured before interview
         if stored_audio_path and os.path.exists(stored_audio_path):
-            audio_match = await audio_service.verify_audio(audio_path, stored_audio_path)
+            audio_task = audio_service.verify_audio(audio_path, stored_audio_path)
         else:
-            print("Stored audio file not found, allowing verification")
-            audio_match = True  # Allow if stored audio not found
-    
-    # Clean up temp files
-    try:
-        if os.path.exists(snapshot_path):
-            os.remove(snapshot_path)
-        if audio_clip and audio_path and os.path.exists(audio_path):
+            logger.warning("Stored audio file not found, allowing verification")
+
+    # Face and audio verification are independent - run them concurrently so
+    # the tick takes max(face, audio) instead of their sum
+    audio_match = True
+    if audio_task is not None:
+        (face_match, face_reason), audio_match = await asyncio.gather(
+            face_service.verify_face(snapshot_bytes, stored_face_id),
+            audio_task
+        )
+    else:
+        face_match, face_reason = await face_service.verify_face(snapshot_bytes, stored_face_id)
+
+    # Check for face violations - send alert immediately on first failure
+    is_face_violation = face_reason in ["no_face", "different_face"]
+
+    if is_face_violation:
+        logger.info("Face violation detected: %s", face_reason)
+    else:
+        logger.debug("Face verification passed: %s", face_reason)
+
+    # Clean up the audio temp file (the snapshot never touched disk); no
+    # exists() probe first - a missing file is fine, one syscall not two
+    if audio_path:
+        try:
             os.remove(audio_path)
-    except Exception as e:
-        print(f"Error cleaning up temp files: {str(e)}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning("Error cleaning up temp files: %s", e)
     
     # Alert immediately on first violation (no need to wait for consecutive failures)
     # - Face: immediate alert on no_face or different_face
@@ -446,38 +614,61 @@ async def verify_user(
         violation_type = "audio_violation"
         should_alert = True
     
+    # Counter updates go through atomic UPDATEs on the row: with several
+    # uvicorn workers the ticks for one interview are spread across
+    # processes, so the database is the only count they all agree on.
+    # RETURNING gives the post-increment value without a second round trip
     if should_alert:
-        interview.alert_count = (interview.alert_count or 0) + 1
-        db.commit()
-        
+        alert_count = await db.scalar(
+            update(Interview)
+            .where(Interview.id == interview.id)
+            .values(alert_count=Interview.alert_count + 1)
+            .returning(Interview.alert_count)
+        )
+
         # Terminate after 5 alerts
-        if interview.alert_count >= 5:
+        terminated = alert_count >= 5
+        if terminated:
             interview.status = "terminated"
             interview.termination_reason = violation_type
-            db.commit()
+        await db.commit()
+
+        if terminated:
             return {
                 "verified": False,
                 "alert": True,
                 "terminated": True,
                 "violation_type": violation_type,
-                "alert_count": interview.alert_count,
-                "message": f"Interview terminated after {interview.alert_count} violations: {violation_type.replace('_', ' ')}"
+                "alert_count": alert_count,
+                "message": f"Interview terminated after {alert_count} violations: {violation_type.replace('_', ' ')}"
             }
-        
+
         return {
             "verified": False,
             "alert": True,
-            "alert_count": interview.alert_count,
+            "alert_count": alert_count,
             "violation_type": violation_type,
-            "message": f"Identity verification failed: {violation_type.replace('_', ' ')} (Alert {interview.alert_count}/5)"
+            "message": f"Identity verification failed: {violation_type.replace('_', ' ')} (Alert {alert_count}/5)"
         }
-    
-    # If no violation and face matches successfully, reset alert count
-    # This gives the user a chance to recover from previous violations
-    if not is_face_violation and audio_match and interview.alert_count > 0:
-        print(f"Face verification successful - resetting alert count from {interview.alert_count} to 0")
-        interview.alert_count = 0
-        db.commit()
+
+    # No violation: clear any accumulated alerts so the user can recover.
+    # The guarded UPDATE only matches when there is something to reset, and
+    # the transaction is closed either way - even a 0-row UPDATE takes
+    # SQLite's write lock, and an autobegun transaction left open would
+    # hold it for the life of a WebSocket connection, blocking every other
+    # writer in the app
+    result = await db.execute(
+        update(Interview)
+        .where(Interview.id == interview.id, Interview.alert_count > 0)
+        .values(alert_count=0)
+    )
+    if result.rowcount or pending_writes:
+        await db.commit()
+    else:
+        await db.rollback()
+
+    if result.rowcount:
+        logger.info("Face verification successful - resetting alert count to 0")
         return {
             "verified": True,
             "alert": False,
@@ -485,20 +676,21 @@ async def verify_user(
             "alert_reset": True,
             "message": "Verification successful - alert count reset"
         }
-    
-    # If no violation, verification is successful
-    return {"verified": True, "alert": False, "alert_count": interview.alert_count or 0}
+
+    return {"verified": True, "alert": False, "alert_count": 0}
 
 @app.get("/api/interviews/{interview_id}/question-audio/{audio_filename}")
 async def get_question_audio(
     interview_id: int,
     audio_filename: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get question audio file for TTS"""
     # Verify interview belongs to user
-    interview = db.query(Interview).filter(Interview.id == interview_id, Interview.user_id == current_user.id).first()
+    interview = await db.scalar(
+        select(Interview).where(Interview.id == interview_id, Interview.user_id == current_user.id)
+    )
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
     
@@ -517,13 +709,15 @@ async def get_question_audio(
 async def get_summary(
     interview_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get interview summary (for completed or terminated interviews)"""
-    interview = db.query(Interview).filter(
-        Interview.id == interview_id,
-        Interview.user_id == current_user.id
-    ).first()
+    interview = await db.scalar(
+        select(Interview).where(
+            Interview.id == interview_id,
+            Interview.user_id == current_user.id
+        )
+    )
 
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
@@ -532,8 +726,14 @@ async def get_summary(
     if interview.status not in ("completed", "terminated"):
         raise HTTPException(status_code=400, detail="Interview not completed or terminated yet")
 
-    # Get all answers given before completion/termination
-    answers = db.query(Answer).filter(Answer.interview_id == interview_id).all()
+    # Get all answers with their question texts in a single JOIN instead of
+    # one question lookup per answer
+    rows = (await db.execute(
+        select(Answer, Question.question_text)
+        .join(Question, Question.id == Answer.question_id)
+        .where(Answer.interview_id == interview_id)
+    )).all()
+    answers = [answer for answer, _ in rows]
 
     total_score = sum(answer.score for answer in answers)
     average_score = total_score / len(answers) if answers else 0
@@ -541,39 +741,107 @@ async def get_summary(
     # Generate high-level summary using evaluation service
     summary = await evaluation_service.generate_summary(interview, answers, db)
 
-    return {
-        "interview_id": interview.id,
-        "interview_type": interview.interview_type,
-        "status": interview.status,
-        "termination_reason": interview.termination_reason,  # Include termination reason
-        "total_questions": len(answers),
-        "average_score": average_score,
-        "total_score": total_score,
-        "summary": summary,
-        "answers": [
-            {
-                "question": db.query(Question).filter(Question.id == answer.question_id).first().question_text,
+    from fastapi.responses import StreamingResponse
+
+    # Stream the response: the header goes out as soon as the summary is
+    # ready and each answer (feedback can be long) is serialized one at a
+    # time instead of building the whole payload in memory first
+    async def gen():
+        head = {
+            "interview_id": interview.id,
+            "interview_type": interview.interview_type,
+            "status": interview.status,
+            "termination_reason": interview.termination_reason,  # Include termination reason
+            "total_questions": len(answers),
+            "average_score": average_score,
+            "total_score": total_score,
+            "summary": summary,
+        }
+        yield json.dumps(head)[:-1] + ', "answers": ['
+        first = True
+        for answer, question_text in rows:
+            if not first:
+                yield ','
+            first = False
+            yield json.dumps({
+                "question": question_text,
                 "answer": answer.answer_text,
                 "score": answer.score,
                 "feedback": answer.feedback,
-            }
-            for answer in answers
-        ],
-    }
+            })
+        yield ']}'
+
+    return StreamingResponse(gen(), media_type="application/json")
 
 @app.websocket("/ws/interviews/{interview_id}")
 async def websocket_endpoint(websocket: WebSocket, interview_id: int):
-    """WebSocket for real-time monitoring"""
+    """WebSocket for real-time monitoring and identity verification
+
+    Authenticates once at connect time (?token=...) and keeps one session
+    for the connection, so the 5-second verification loop skips the
+    per-request HTTP, JWT and auth-lookup overhead of the REST endpoint.
+    The REST /verify endpoint remains as a fallback.
+    """
+    token = websocket.query_params.get("token")
+    payload = verify_token(token) if token else None
+    if payload is None:
+        await websocket.close(code=1008)
+        return
     await websocket.accept()
-    try:
-        while True:
-            data = await websocket.receive_json()
-            # Handle real-time monitoring data
-            await websocket.send_json({"status": "received"})
-    except WebSocketDisconnect:
-        pass
+
+    async with SessionLocal() as db:
+        user = await db.scalar(select(User).where(User.email == payload.get("sub")))
+        interview = None
+        if user is not None:
+            interview = await db.scalar(
+                select(Interview).where(Interview.id == interview_id, Interview.user_id == user.id)
+            )
+        if interview is None:
+            await websocket.close(code=1008)
+            return
+        sample = await db.scalar(
+            select(Sample).where(Sample.user_id == user.id)
+            .order_by(Sample.created_at.desc()).limit(1)
+        )
+        # End the autobegun read transaction from the connect-time loads;
+        # the session lives as long as the socket, and parking an open
+        # transaction between ticks pins a stale WAL snapshot and blocks
+        # checkpoints
+        await db.rollback()
+
+        try:
+            while True:
+                # orjson instead of receive_json/send_json: same text frames
+                # on the wire, but parsing and serialization skip stdlib json
+                data = orjson.loads(await websocket.receive_text())
+                if data.get("type") == "verify" and sample is not None:
+                    # The snapshot stays in memory; only the audio clip needs
+                    # a real file for its decoder
+                    snap_bytes = base64.b64decode(data["snapshot_b64"])
+                    audio_path = None
+                    if data.get("audio_b64"):
+                        audio_path = f"temp/{interview_id}_{uuid.uuid4().hex[:8]}_audio.webm"
+                        await _write_bytes(audio_path, base64.b64decode(data["audio_b64"]))
+                    result = await _run_verification(db, interview, sample, snap_bytes, audio_path)
+                    await websocket.send_text(orjson.dumps(result).decode())
+                else:
+                    # Other real-time monitoring data
+                    await websocket.send_text('{"status": "received"}')
+        except WebSocketDisconnect:
+            pass
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # One worker per logical core (2n+1 rule) so verify polling scales
+    # across cores; the import-string form makes each worker build its own
+    # services and engine at import. Override with WEB_CONCURRENCY=1 for
+    # development.
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() * 2 + 1)),
+        loop="uvloop",
+        http="httptools",
+    )
 
@@ -0,0 +1,42 @@
+"""
+Migration script to add the denormalized answered_count column to the
+interviews table and backfill it from existing answers
+Run this once to update your existing database
+"""
+import sqlite3
+import os
+
+# Database file path
+db_path = "interview.db"
+
+if not os.path.exists(db_path):
+    print(f"Database file {db_path} not found!")
+    exit(1)
+
+try:
+    # Connect to database
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    # Check if column already exists
+    cursor.execute("PRAGMA table_info(interviews)")
+    columns = [column[1] for column in cursor.fetchall()]
+
+    if "answered_count" in columns:
+        print("Column 'answered_count' already exists. No migration needed.")
+    else:
+        # Add the column and backfill from the answers table
+        cursor.execute("ALTER TABLE interviews ADD COLUMN answered_count INTEGER DEFAULT 0")
+        cursor.execute(
+            "UPDATE interviews SET answered_count = "
+            "(SELECT COUNT(*) FROM answers WHERE answers.interview_id = interviews.id)"
+        )
+        conn.commit()
+        print("Successfully added and backfilled 'answered_count' on interviews table!")
+
+    conn.close()
+    print("Migration completed successfully!")
+
+except Exception as e:
+    print(f"Error during migration: {str(e)}")
+    exit(1)
@@ -0,0 +1,39 @@
+"""
+Migration script to add indexes for the hot query paths
+Run this once to update your existing database (fresh databases get the
+indexes from create_all at startup)
+"""
+import sqlite3
+import os
+
+# Database file path
+db_path = "interview.db"
+
+# Matches the __table_args__ indexes declared in models.py
+indexes = [
+    ("ix_sample_user_created", "CREATE INDEX IF NOT EXISTS ix_sample_user_created ON samples (user_id, created_at DESC)"),
+    ("ix_interview_user", "CREATE INDEX IF NOT EXISTS ix_interview_user ON interviews (user_id, id)"),
+    ("ix_question_interview", "CREATE INDEX IF NOT EXISTS ix_question_interview ON questions (interview_id)"),
+    ("ix_answer_interview", "CREATE INDEX IF NOT EXISTS ix_answer_interview ON answers (interview_id)"),
+]
+
+if not os.path.exists(db_path):
+    print(f"Database file {db_path} not found!")
+    exit(1)
+
+try:
+    # Connect to database
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    for name, ddl in indexes:
+        cursor.execute(ddl)
+        print(f"Ensured index '{name}' exists.")
+
+    conn.commit()
+    conn.close()
+    print("Migration completed successfully!")
+
+except Exception as e:
+    print(f"Error during migration: {str(e)}")
+    exit(1)
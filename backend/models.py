@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from database import Base
@@ -28,6 +28,12 @@ class Sample(Base):
     
     user = relationship("User", back_populates="samples")
 
+    # Serves the most-recent-sample lookup (user_id = ? ORDER BY created_at
+    # DESC LIMIT 1) with a single index seek
+    __table_args__ = (
+        Index("ix_sample_user_created", "user_id", created_at.desc()),
+    )
+
 class Interview(Base):
     __tablename__ = "interviews"
     
@@ -36,6 +42,7 @@ class Interview(Base):
     interview_type = Column(String)  # ai, react, java, etc.
     status = Column(String, default="pending")  # pending, in_progress, completed, terminated
     alert_count = Column(Integer, default=0)
+    answered_count = Column(Integer, default=0)  # Denormalized COUNT(answers) to skip per-request counting
     consecutive_face_failures = Column(Integer, default=0)  # Track consecutive face failures
     termination_reason = Column(String, nullable=True)  # face_violation, audio_violation, tab_switch
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -45,6 +52,11 @@ class Interview(Base):
     questions = relationship("Question", back_populates="interview")
     answers = relationship("Answer", back_populates="interview")
 
+    # Every interview endpoint filters on (id, user_id)
+    __table_args__ = (
+        Index("ix_interview_user", "user_id", "id"),
+    )
+
 class Question(Base):
     __tablename__ = "questions"
     
@@ -59,6 +71,11 @@ class Question(Base):
     interview = relationship("Interview", back_populates="questions")
     answers = relationship("Answer", back_populates="question")
 
+    # submit_answer validates the question against its interview_id
+    __table_args__ = (
+        Index("ix_question_interview", "interview_id"),
+    )
+
 class Answer(Base):
     __tablename__ = "answers"
     
@@ -73,3 +90,8 @@ class Answer(Base):
     interview = relationship("Interview", back_populates="answers")
     question = relationship("Question", back_populates="answers")
 
+    # Answer counts and listings filter on interview_id
+    __table_args__ = (
+        Index("ix_answer_interview", "interview_id"),
+    )
+
@@ -1,48 +1,104 @@
+import asyncio
 import httpx
+import orjson
 import os
-import json
+import time
 from typing import Dict, List
-from dotenv import load_dotenv
-
-load_dotenv()
+from config import settings
 
 class QuestionService:
     def __init__(self):
-        self.openrouter_api_key = os.getenv("OPENROUTER_API_KEY")
+        self.openrouter_api_key = settings.openrouter_api_key
         self.openrouter_url = "https://openrouter.ai/api/v1/chat/completions"
         self.question_bank_path = "question_bank.json"
         self.question_bank = self._load_question_bank()
+        # One shared client so question generation reuses pooled keep-alive
+        # connections instead of a fresh TCP+TLS handshake per question
+        self._client = httpx.AsyncClient(
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+            headers={
+                "Authorization": f"Bearer {self.openrouter_api_key}",
+                "Content-Type": "application/json"
+            }
+        )
+
+        # LLM questions for the same (type, number, difficulty) are
+        # interchangeable across interviews, so generated ones are cached for
+        # a day instead of paying the 30s round trip again
+        self._generated_cache = {}
+        self._generated_cache_ttl = 86400.0
+        # Concurrent misses for the same question coalesce onto one in-flight
+        # LLM call instead of fanning out N identical requests
+        self._inflight = {}
+
+    async def aclose(self):
+        """Close the shared HTTP client (called on app shutdown)"""
+        await self._client.aclose()
     
     def _load_question_bank(self) -> Dict:
-        """Load questions from question bank file"""
+        """Load the question bank, materializing defaults so lookups are pure"""
         try:
             if os.path.exists(self.question_bank_path):
-                with open(self.question_bank_path, "r") as f:
-                    return json.load(f)
+                with open(self.question_bank_path, "rb") as f:
+                    raw = orjson.loads(f.read())
+                # The bank is read-only at runtime, so build the response
+                # shape once at startup instead of per request
+                return {
+                    interview_type: [
+                        {
+                            "question": q["question"],
+                            "type": q.get("type", "text"),
+                            "time_limit": q.get("time_limit", 300),
+                            "difficulty": q.get("difficulty", "medium")
+                        }
+                        for q in questions
+                    ]
+                    for interview_type, questions in raw.items()
+                }
         except Exception as e:
             print(f"Error loading question bank: {str(e)}")
         return {}
-    
+
     async def get_question(self, interview_type: str, question_number: int) -> Dict:
         """Get a question for the interview"""
         # Try to get from question bank first
-        if interview_type in self.question_bank and question_number < len(self.question_bank[interview_type]):
-            question = self.question_bank[interview_type][question_number]
-            return {
-                "question": question["question"],
-                "type": question.get("type", "text"),
-                "time_limit": question.get("time_limit", 300),
-                "difficulty": question.get("difficulty", "medium")
-            }
-        
+        bank = self.question_bank.get(interview_type)
+        if bank and question_number < len(bank):
+            return bank[question_number]
+
         # Generate using LLM
         return await self._generate_question_llm(interview_type, question_number)
     
     async def _generate_question_llm(self, interview_type: str, question_number: int) -> Dict:
         """Generate question using OpenRouter API"""
+        difficulty = "easy" if question_number < 3 else "medium" if question_number < 7 else "hard"
+
+        cache_key = (interview_type, question_number, difficulty)
+        cached = self._generated_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[1] < self._generated_cache_ttl:
+            return cached[0]
+
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            return await inflight
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            result = await self._call_llm(interview_type, question_number, difficulty, cache_key)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._inflight.pop(cache_key, None)
+
+    async def _call_llm(self, interview_type: str, question_number: int, difficulty: str, cache_key: tuple) -> Dict:
+        """Issue the OpenRouter request and cache a successful result"""
         try:
-            difficulty = "easy" if question_number < 3 else "medium" if question_number < 7 else "hard"
-            
             prompt = f"""Generate an interview question for a {interview_type} interview.
 Question number: {question_number + 1} out of 10
 Difficulty: {difficulty}
@@ -55,35 +111,33 @@ The question should be:
 
 Return ONLY the question text, nothing else."""
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.openrouter_url,
-                    headers={
-                        "Authorization": f"Bearer {self.openrouter_api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": "openai/gpt-3.5-turbo",
-                        "messages": [
-                            {"role": "system", "content": "You are an expert interview question generator."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        "temperature": 0.7,
-                        "max_tokens": 200
-                    },
-                    timeout=30.0
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    question_text = data["choices"][0]["message"]["content"].strip()
-                    
-                    return {
-                        "question": question_text,
-                        "type": "text",
-                        "time_limit": 300,
-                        "difficulty": difficulty
-                    }
+            response = await self._client.post(
+                self.openrouter_url,
+                json={
+                    "model": "openai/gpt-3.5-turbo",
+                    "messages": [
+                        {"role": "system", "content": "You are an expert interview question generator."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    "temperature": 0.7,
+                    "max_tokens": 200
+                }
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                question_text = data["choices"][0]["message"]["content"].strip()
+
+                result = {
+                    "question": question_text,
+                    "type": "text",
+                    "time_limit": 300,
+                    "difficulty": difficulty
+                }
+                # Only successful generations are cached; fallbacks below
+                # stay uncached so a transient API error doesn't stick
+                self._generated_cache[cache_key] = (result, time.monotonic())
+                return result
         except Exception as e:
             print(f"Error generating question with LLM: {str(e)}")
         